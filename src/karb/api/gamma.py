@@ -55,6 +55,8 @@ class GammaClient:
         closed: bool = False,
         limit: int = 100,
         offset: int = 0,
+        order: Optional[str] = None,
+        ascending: bool = True,
     ) -> list[dict[str, Any]]:
         """
         Fetch markets from the Gamma API.
@@ -64,6 +66,8 @@ class GammaClient:
             closed: Include closed markets
             limit: Maximum number of markets to return
             offset: Pagination offset
+            order: Field to sort by server-side (e.g. "volume")
+            ascending: Sort direction when order is set
 
         Returns:
             List of market dictionaries
@@ -76,6 +80,9 @@ class GammaClient:
             params["active"] = "true"
         # Explicitly set closed parameter
         params["closed"] = "true" if closed else "false"
+        if order:
+            params["order"] = order
+            params["ascending"] = "true" if ascending else "false"
 
         data = await self._get("/markets", params)
 
@@ -770,6 +770,9 @@ class RealtimeArbitrageBot:
         except Exception:
             pass
 
+        from karb.executor.redemption import close_client
+
+        await close_client()
         await self.scanner.close()
         await self.executor.close()
         self._log_stats()
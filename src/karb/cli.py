@@ -1,18 +1,39 @@
 """Command-line interface for karb."""
 
 import asyncio
+import heapq
 import sys
-from typing import Optional
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Optional
 
 import click
-from rich.console import Console
-from rich.table import Table
 
 from karb import __version__
-from karb.config import get_settings, reload_settings
-from karb.utils.logging import setup_logging
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Rich is imported on first use so `karb --help` does not pay for it
+_console: Optional["Console"] = None
+
+
+def get_console() -> "Console":
+    """Get the shared Rich console, importing Rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def _get_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Use uvloop's event loop; fall back to asyncio's default on Windows."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
 
 
 @click.group()
@@ -38,25 +59,22 @@ def run(
     log_level: str,
 ) -> None:
     """Run the arbitrage bot."""
-    import os
+    from karb.config import override_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
 
     # Override settings from CLI
-    if dry_run is not None:
-        os.environ["DRY_RUN"] = str(dry_run).lower()
-    if poll_interval is not None:
-        os.environ["POLL_INTERVAL_SECONDS"] = str(poll_interval)
-    if min_profit is not None:
-        os.environ["MIN_PROFIT_THRESHOLD"] = str(min_profit)
-    if max_position is not None:
-        os.environ["MAX_POSITION_SIZE"] = str(max_position)
-    if log_level:
-        os.environ["LOG_LEVEL"] = log_level
-
-    reload_settings()
+    overrides = {
+        "dry_run": dry_run,
+        "poll_interval_seconds": poll_interval,
+        "min_profit_threshold": min_profit,
+        "max_position_size": max_position,
+        "log_level": log_level,
+    }
+    settings = override_settings(**{k: v for k, v in overrides.items() if v is not None})
     setup_logging(log_level)
 
-    settings = get_settings()
-
     mode = "[yellow]DRY RUN[/yellow]" if settings.dry_run else "[red]LIVE TRADING[/red]"
     engine = "[cyan]REAL-TIME WebSocket[/cyan]" if realtime else "[dim]Legacy Polling[/dim]"
     console.print(f"\n[bold]Karb Arbitrage Bot[/bold] - {mode}")
@@ -78,13 +96,15 @@ def run(
     console.print(f"[dim]Max position:[/dim] ${settings.max_position_size}")
     console.print()
 
+    loop_factory = _get_loop_factory()
+
     try:
         if realtime:
             from karb.bot import run_realtime_bot
-            asyncio.run(run_realtime_bot())
+            asyncio.run(run_realtime_bot(), loop_factory=loop_factory)
         else:
             from karb.bot import run_bot
-            asyncio.run(run_bot())
+            asyncio.run(run_bot(), loop_factory=loop_factory)
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted[/yellow]")
 
@@ -92,6 +112,12 @@ def run(
 @cli.command()
 def scan() -> None:
     """Scan markets once and show opportunities."""
+    from rich.table import Table
+
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("INFO")
 
     async def _scan() -> None:
@@ -121,15 +147,19 @@ def scan() -> None:
             table.add_column("Profit %", justify="right", style="green")
             table.add_column("Max Size", justify="right")
 
-            for opp in opportunities[:20]:  # Top 20
-                table.add_row(
+            rows = [
+                (
                     opp.market.question[:40],
-                    f"${float(opp.yes_ask):.3f}",
-                    f"${float(opp.no_ask):.3f}",
-                    f"${float(opp.combined_cost):.3f}",
-                    f"{float(opp.profit_pct) * 100:.2f}%",
-                    f"${float(opp.max_trade_size):.0f}",
+                    f"${opp.yes_ask:.3f}",
+                    f"${opp.no_ask:.3f}",
+                    f"${opp.combined_cost:.3f}",
+                    f"{opp.profit_pct:.2%}",
+                    f"${opp.max_trade_size:.0f}",
                 )
+                for opp in opportunities[:20]  # Top 20
+            ]
+            for row in rows:
+                table.add_row(*row)
 
             console.print(table)
 
@@ -140,6 +170,12 @@ def scan() -> None:
 @click.option("--limit", default=30, help="Maximum markets to show")
 def markets(limit: int) -> None:
     """List active markets."""
+    from rich.table import Table
+
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("WARNING")
 
     async def _markets() -> None:
@@ -148,8 +184,10 @@ def markets(limit: int) -> None:
         console.print("[bold]Fetching markets...[/bold]\n")
 
         async with GammaClient() as client:
-            # Just fetch one page of markets
-            raw_markets = await client.get_markets(active=True, limit=100)
+            # Just fetch one page of markets, highest volume first
+            raw_markets = await client.get_markets(
+                active=True, limit=100, order="volume", ascending=False
+            )
             markets = []
             for raw in raw_markets:
                 m = client.parse_market(raw)
@@ -157,7 +195,7 @@ def markets(limit: int) -> None:
                     markets.append(m)
 
             # Sort by volume
-            markets.sort(key=lambda m: m.volume, reverse=True)
+            markets.sort(key=attrgetter("volume"), reverse=True)
 
             table = Table(title=f"Active Markets (showing {min(limit, len(markets))} of {len(markets)})")
             table.add_column("Market", style="cyan", max_width=50)
@@ -166,14 +204,18 @@ def markets(limit: int) -> None:
             table.add_column("YES", justify="right")
             table.add_column("NO", justify="right")
 
-            for market in markets[:limit]:
-                table.add_row(
+            rows = [
+                (
                     market.question[:50],
-                    f"${float(market.volume):,.0f}",
-                    f"${float(market.liquidity):,.0f}",
-                    f"${float(market.yes_price):.2f}",
-                    f"${float(market.no_price):.2f}",
+                    f"${market.volume:,.0f}",
+                    f"${market.liquidity:,.0f}",
+                    f"${market.yes_price:.2f}",
+                    f"${market.no_price:.2f}",
                 )
+                for market in markets[:limit]
+            ]
+            for row in rows:
+                table.add_row(*row)
 
             console.print(table)
 
@@ -183,6 +225,12 @@ def markets(limit: int) -> None:
 @cli.command()
 def config() -> None:
     """Show current configuration."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+
+    console = get_console()
+
     settings = get_settings()
 
     table = Table(title="Current Configuration")
@@ -217,6 +265,12 @@ def config() -> None:
 @click.argument("token_id")
 def orderbook(token_id: str) -> None:
     """Show orderbook for a token."""
+    from rich.table import Table
+
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("WARNING")
 
     async def _orderbook() -> None:
@@ -232,16 +286,16 @@ def orderbook(token_id: str) -> None:
             bid_table.add_column("Price", justify="right", style="green")
             bid_table.add_column("Size", justify="right")
 
-            for level in sorted(ob.bids, key=lambda x: x.price, reverse=True)[:10]:
-                bid_table.add_row(f"${float(level.price):.4f}", f"{float(level.size):,.2f}")
+            for level in heapq.nlargest(10, ob.bids, key=attrgetter("price")):
+                bid_table.add_row(f"${level.price:.4f}", f"{level.size:,.2f}")
 
             # Asks
             ask_table = Table(title="Asks (Sell Orders)")
             ask_table.add_column("Price", justify="right", style="red")
             ask_table.add_column("Size", justify="right")
 
-            for level in sorted(ob.asks, key=lambda x: x.price)[:10]:
-                ask_table.add_row(f"${float(level.price):.4f}", f"{float(level.size):,.2f}")
+            for level in heapq.nsmallest(10, ob.asks, key=attrgetter("price")):
+                ask_table.add_row(f"${level.price:.4f}", f"{level.size:,.2f}")
 
             console.print(bid_table)
             console.print()
@@ -250,9 +304,9 @@ def orderbook(token_id: str) -> None:
             # Summary
             if ob.best_bid and ob.best_ask:
                 spread = ob.best_ask - ob.best_bid
-                console.print(f"\n[dim]Best Bid:[/dim] ${float(ob.best_bid):.4f}")
-                console.print(f"[dim]Best Ask:[/dim] ${float(ob.best_ask):.4f}")
-                console.print(f"[dim]Spread:[/dim] ${float(spread):.4f} ({float(spread / ob.best_ask) * 100:.2f}%)")
+                console.print(f"\n[dim]Best Bid:[/dim] ${ob.best_bid:.4f}")
+                console.print(f"[dim]Best Ask:[/dim] ${ob.best_ask:.4f}")
+                console.print(f"[dim]Spread:[/dim] ${spread:.4f} ({spread / ob.best_ask:.2%})")
 
     asyncio.run(_orderbook())
 
@@ -269,16 +323,14 @@ def crossplatform(
     log_level: str,
 ) -> None:
     """Run cross-platform arbitrage scanner (Polymarket vs Kalshi)."""
-    import os
+    from karb.config import override_settings
+    from karb.utils.logging import setup_logging
 
-    if dry_run is not None:
-        os.environ["DRY_RUN"] = str(dry_run).lower()
+    console = get_console()
 
-    reload_settings()
+    settings = override_settings(dry_run=dry_run)
     setup_logging(log_level)
 
-    settings = get_settings()
-
     mode = "[yellow]DRY RUN[/yellow]" if settings.dry_run else "[red]LIVE TRADING[/red]"
     console.print(f"\n[bold]Cross-Platform Arbitrage Scanner[/bold] - {mode}")
     console.print(f"[bold]Platforms:[/bold] Polymarket + Kalshi\n")
@@ -313,6 +365,13 @@ def crossplatform(
 @cli.command()
 def kalshi_test() -> None:
     """Test Kalshi API connection."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("INFO")
 
     async def _test() -> None:
@@ -362,6 +421,13 @@ def kalshi_test() -> None:
 @cli.command()
 def crossplatform_scan() -> None:
     """Run a single cross-platform scan."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("INFO")
 
     async def _scan() -> None:
@@ -413,6 +479,13 @@ def crossplatform_scan() -> None:
 @cli.command()
 def status() -> None:
     """Show bot status, balances, and recent activity."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("WARNING")
 
     async def _status() -> None:
@@ -507,6 +580,12 @@ def status() -> None:
 @cli.command()
 def balance() -> None:
     """Show current balances on all platforms."""
+    from rich.table import Table
+
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("WARNING")
 
     async def _balance() -> None:
@@ -541,6 +620,11 @@ def approve_redemption() -> None:
     This is required once before you can redeem resolved positions.
     Sets approval for both CTFExchange and NegRiskCTFExchange.
     """
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("INFO")
     settings = get_settings()
 
@@ -649,8 +733,11 @@ def approve_redemption() -> None:
 @click.option("--platform", type=click.Choice(["polymarket", "kalshi"]), help="Filter by platform")
 def trades(limit: int, platform: Optional[str]) -> None:
     """Show trade history."""
+    from rich.table import Table
+
     from karb.tracking.trades import TradeLog
 
+    console = get_console()
     trade_log = TradeLog()
     recent = trade_log.get_trades(limit=limit, platform=platform)
 
@@ -698,6 +785,7 @@ def pnl() -> None:
     from karb.tracking.portfolio import PortfolioTracker
     from karb.tracking.trades import TradeLog
 
+    console = get_console()
     tracker = PortfolioTracker()
     trade_log = TradeLog()
 
@@ -725,10 +813,29 @@ def pnl() -> None:
 @cli.command()
 def redeem() -> None:
     """Redeem resolved positions back to USDC."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("INFO")
 
     async def _redeem() -> None:
-        from karb.executor.redemption import get_redeemable_positions, redeem_all_positions
+        from karb.executor.redemption import close_client
+
+        try:
+            await _redeem_positions()
+        finally:
+            await close_client()
+
+    async def _redeem_positions() -> None:
+        from karb.executor.redemption import (
+            get_redeemable_positions,
+            order_positions_for_redemption,
+            redeem_all_positions,
+        )
 
         settings = get_settings()
 
@@ -741,6 +848,16 @@ def redeem() -> None:
         # First show what we'll redeem
         positions = await get_redeemable_positions(settings.wallet_address)
 
+        # Preview exactly what redeem_all_positions will submit, in order
+        positions, skipped = order_positions_for_redemption(positions, settings)
+
+        if skipped:
+            skipped_value = sum(float(p.get("currentValue", 0)) for p in skipped)
+            console.print(
+                f"[dim]Skipping {len(skipped)} zero-value position(s) "
+                f"(${skipped_value:.2f}, SKIP_ZERO_VALUE_REDEMPTIONS is set)[/dim]\n"
+            )
+
         if not positions:
             console.print("[yellow]No positions to redeem[/yellow]")
             return
@@ -792,6 +909,13 @@ def redeem() -> None:
 @cli.command()
 def positions() -> None:
     """Show current positions from Polymarket."""
+    from rich.table import Table
+
+    from karb.config import get_settings
+    from karb.utils.logging import setup_logging
+
+    console = get_console()
+
     setup_logging("WARNING")
 
     async def _positions() -> None:
@@ -881,7 +1005,11 @@ def backfill_balance(polygonscan_api_key: Optional[str], dry_run: bool) -> None:
     import httpx
     from datetime import datetime
     from collections import defaultdict
+    from rich.table import Table
 
+    from karb.config import get_settings
+
+    console = get_console()
     settings = get_settings()
 
     if not settings.wallet_address:
@@ -991,6 +1119,10 @@ def backfill_balance(polygonscan_api_key: Optional[str], dry_run: bool) -> None:
 @click.option("--port", type=int, help="Port to run on (default: from config)")
 def dashboard(host: str, port: Optional[int]) -> None:
     """Run the web dashboard."""
+    from karb.config import get_settings
+
+    console = get_console()
+
     settings = get_settings()
 
     actual_port = port or settings.dashboard_port
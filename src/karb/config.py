@@ -1,7 +1,8 @@
 """Configuration management for karb."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,6 +15,7 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        validate_assignment=True,
     )
 
     # Wallet Configuration
@@ -72,6 +74,17 @@ class Settings(BaseSettings):
         le=20,
     )
 
+    # Redemption
+    min_redemption_value: float = Field(
+        default=0.01,
+        description="Positions worth more than this (USD) are redeemed first",
+        ge=0.0,
+    )
+    skip_zero_value_redemptions: bool = Field(
+        default=False,
+        description="If true, don't redeem positions worth min_redemption_value or less",
+    )
+
     # API Endpoints
     clob_base_url: str = Field(
         default="https://clob.polymarket.com",
@@ -200,20 +213,24 @@ class Settings(BaseSettings):
         return False
 
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
 def reload_settings() -> Settings:
     """Reload settings from environment."""
-    global _settings
-    _settings = Settings()
-    return _settings
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def override_settings(**overrides: Any) -> Settings:
+    """Apply explicit overrides (e.g. CLI flags) to the global settings instance.
+
+    Each value is validated on assignment, without re-reading the environment.
+    """
+    settings = get_settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
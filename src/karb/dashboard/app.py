@@ -368,7 +368,10 @@ def create_app() -> FastAPI:
     @app.get("/api/redeemable")
     async def get_redeemable(username: str = Depends(verify_credentials)):
         """Get positions that can be redeemed."""
-        from karb.executor.redemption import get_redeemable_positions
+        from karb.executor.redemption import (
+            get_redeemable_positions,
+            order_positions_for_redemption,
+        )
 
         settings = get_settings()
         if not settings.wallet_address:
@@ -376,7 +379,10 @@ def create_app() -> FastAPI:
 
         try:
             positions = await get_redeemable_positions(settings.wallet_address)
+            # List exactly what /api/redeem will submit, in order
+            positions, skipped = order_positions_for_redemption(positions, settings)
             total_value = sum(float(p.get("currentValue", 0)) for p in positions)
+            skipped_value = sum(float(p.get("currentValue", 0)) for p in skipped)
 
             return {
                 "positions": [
@@ -391,6 +397,8 @@ def create_app() -> FastAPI:
                 ],
                 "count": len(positions),
                 "total_value": total_value,
+                "skipped_count": len(skipped),
+                "skipped_value": skipped_value,
             }
         except Exception as e:
             log.error("Failed to get redeemable positions", error=str(e))
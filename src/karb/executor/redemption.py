@@ -5,11 +5,16 @@ Uses polymarket-apis package to redeem winning positions back to USDC.
 """
 
 import asyncio
-from typing import Optional, Tuple
+import atexit
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Tuple
 
 import httpx
 
-from karb.config import get_settings
+from karb.config import Settings, get_settings
 from karb.utils.logging import get_logger
 
 log = get_logger(__name__)
@@ -17,9 +22,82 @@ log = get_logger(__name__)
 # Data API for fetching positions
 DATA_API_URL = "https://data-api.polymarket.com"
 
+# Per-request timeout and retry budget for Data API calls
+DATA_API_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+DATA_API_MAX_ATTEMPTS = 3
+
+# Backoff sleep, kept separate so tests can skip the delay without patching asyncio
+_sleep = asyncio.sleep
+
 # Minimum MATIC balance required to attempt redemptions (in wei)
 MIN_MATIC_FOR_REDEMPTION = 0.05  # ~$0.025 USD, enough for 1 transaction
 
+# Maximum number of redemptions in flight at once. Every redemption is signed
+# and sent from the same EOA, and PolymarketWeb3Client.redeem_position looks up
+# the nonce, sends and waits for the receipt in a single call, so overlapping
+# calls would reuse a nonce. Keep this at 1 until sends can be split from
+# receipt waits (or nonces are managed locally).
+REDEMPTION_CONCURRENCY = 1
+
+# Dedicated pool for blocking web3 redemption calls, kept off the default executor
+_REDEEM_POOL = ThreadPoolExecutor(
+    max_workers=REDEMPTION_CONCURRENCY,
+    thread_name_prefix="redeem",
+)
+atexit.register(_REDEEM_POOL.shutdown, wait=False)
+
+
+class _RateLimiter:
+    """Async limiter spacing acquisitions to at most max_rate per time_period."""
+
+    def __init__(self, max_rate: float, time_period: float = 1.0) -> None:
+        self._interval = time_period / max_rate
+        self._next_slot = 0.0
+
+    async def __aenter__(self) -> None:
+        # Reserve the next free slot before awaiting so concurrent callers queue up
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+# Redemption submissions per second, to stay within RPC rate limits
+_REDEEM_LIMITER = _RateLimiter(max_rate=2, time_period=1.0)
+
+# Web3 clients keyed by (private key hash, chain ID), shared by pool threads.
+# Each client is paired with a lock that must be held while using it, since the
+# client's nonce and signer state is not safe to use from several threads.
+_web3_clients: dict[tuple[int, int], tuple[Any, threading.Lock]] = {}
+_web3_clients_lock = threading.Lock()
+
+# Shared Data API client, reused across redemption checks
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get or create the shared Data API client."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Data API client."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
 
 async def get_matic_balance(wallet_address: str) -> float:
     """Get MATIC balance for gas fees."""
@@ -38,21 +116,72 @@ async def get_matic_balance(wallet_address: str) -> float:
 
 async def get_redeemable_positions(wallet_address: str) -> list[dict]:
     """Fetch all redeemable positions for a wallet."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{DATA_API_URL}/positions?user={wallet_address}")
-        if resp.status_code != 200:
-            log.error("Failed to fetch positions", status=resp.status_code)
-            return []
+    client = _get_client()
+    # Let the Data API filter to redeemable positions so we only download those
+    for attempt in range(1, DATA_API_MAX_ATTEMPTS + 1):
+        try:
+            resp = await client.get(
+                f"{DATA_API_URL}/positions",
+                params={"user": wallet_address, "redeemable": "true"},
+                timeout=DATA_API_TIMEOUT,
+            )
+            resp.raise_for_status()
+            break
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            # Client errors won't succeed on retry (except rate limiting)
+            if isinstance(e, httpx.HTTPStatusError):
+                status = e.response.status_code
+                if status < 500 and status != 429:
+                    log.error("Failed to fetch positions", status=status)
+                    return []
+
+            if attempt == DATA_API_MAX_ATTEMPTS:
+                log.error("Failed to fetch positions", attempts=attempt, error=str(e))
+                return []
+
+            delay = 2 ** (attempt - 1) + random.random() * 0.2
+            log.warning(
+                "Positions fetch failed, retrying",
+                attempt=attempt,
+                delay=f"{delay:.1f}s",
+                error=str(e),
+            )
+            await _sleep(delay)
 
-        positions = resp.json()
-        redeemable = [p for p in positions if p.get("redeemable")]
+    # Re-check each entry in case the API ignores the redeemable filter
+    redeemable = [p for p in resp.json() if p.get("redeemable")]
+
+    log.info("Found redeemable positions", redeemable=len(redeemable))
+    return redeemable
+
+
+def _get_web3_client(private_key: str, chain_id: int = 137) -> tuple[Any, threading.Lock]:
+    """Get the cached PolymarketWeb3Client for the wallet and the lock guarding its use."""
+    key = (hash(private_key), chain_id)
+    entry = _web3_clients.get(key)
+    if entry is not None:
+        return entry
+
+    with _web3_clients_lock:
+        entry = _web3_clients.get(key)
+        if entry is None:
+            from polymarket_apis import PolymarketWeb3Client
+
+            # signature_type: 0=EOA, 1=Poly proxy, 2=Safe
+            # We use 0 since we're trading with EOA wallet directly
+            client = PolymarketWeb3Client(
+                private_key=private_key,
+                signature_type=0,  # EOA
+                chain_id=chain_id,
+            )
+            entry = (client, threading.Lock())
+            _web3_clients[key] = entry
+        return entry
 
-        log.info(
-            "Found redeemable positions",
-            total_positions=len(positions),
-            redeemable=len(redeemable),
-        )
-        return redeemable
+
+def _build_amounts(size: float, outcome_index: int) -> list[float]:
+    """Build the [first_outcome_shares, second_outcome_shares] redemption amounts."""
+    return [size, 0.0] if outcome_index == 0 else [0.0, size]
 
 
 def redeem_position_sync(
@@ -61,7 +190,7 @@ def redeem_position_sync(
     size: float,
     outcome_index: int,
     neg_risk: bool = False,
-) -> Tuple[Optional[dict], Optional[str]]:
+) -> Tuple[Optional[str], Optional[str]]:
     """
     Redeem a single position synchronously.
 
@@ -73,49 +202,41 @@ def redeem_position_sync(
         neg_risk: Whether this is a negative risk market
 
     Returns:
-        Tuple of (Transaction receipt or None, error_type or None)
+        Tuple of (transaction hash or None, error_type or None)
         error_type can be: "insufficient_gas", "contract_error", "other"
     """
+    short_condition_id = condition_id[:20] + "..."
+
     try:
-        from polymarket_apis import PolymarketWeb3Client
-
-        # signature_type: 0=EOA, 1=Poly proxy, 2=Safe
-        # We use 0 since we're trading with EOA wallet directly
-        client = PolymarketWeb3Client(
-            private_key=private_key,
-            signature_type=0,  # EOA
-            chain_id=137,  # Polygon mainnet
-        )
+        client, client_lock = _get_web3_client(private_key)
 
-        # Build amounts array based on outcome index
-        # [first_outcome_shares, second_outcome_shares]
-        if outcome_index == 0:
-            amounts = [size, 0.0]
-        else:
-            amounts = [0.0, size]
+        amounts = _build_amounts(size, outcome_index)
 
         log.debug(
             "Redeeming position",
-            condition_id=condition_id[:20] + "...",
+            condition_id=short_condition_id,
             amounts=amounts,
             neg_risk=neg_risk,
         )
 
-        receipt = client.redeem_position(
-            condition_id=condition_id,
-            amounts=amounts,
-            neg_risk=neg_risk,
-        )
+        # Sign and send one transaction at a time per wallet
+        with client_lock:
+            receipt = client.redeem_position(
+                condition_id=condition_id,
+                amounts=amounts,
+                neg_risk=neg_risk,
+            )
 
-        log.info(
-            "Redemption successful",
-            tx_hash=receipt.transaction_hash if hasattr(receipt, 'transaction_hash') else str(receipt),
-        )
+        tx_hash = getattr(receipt, "transaction_hash", None)
+        tx_hash_str = str(tx_hash) if tx_hash is not None else str(receipt)
 
-        return receipt, None
+        log.info("Redemption successful", tx_hash=tx_hash_str)
+
+        return tx_hash_str, None
 
     except Exception as e:
-        error_str = str(e).lower()
+        error_msg = str(e)
+        error_str = error_msg.lower()
 
         # Check for insufficient gas/funds error
         if "insufficient funds" in error_str:
@@ -129,15 +250,42 @@ def redeem_position_sync(
         if "execution reverted" in error_str or "safemath" in error_str:
             log.warning(
                 "Redemption failed - contract error",
-                condition_id=condition_id[:20] + "...",
-                error=str(e)[:100],
+                condition_id=short_condition_id,
+                error=error_msg[:100],
             )
             return None, "contract_error"
 
-        log.error("Redemption failed", error=str(e))
+        log.error("Redemption failed", error=error_msg)
         return None, "other"
 
 
+def order_positions_for_redemption(
+    positions: list[dict],
+    settings: Settings,
+) -> Tuple[list[dict], list[dict]]:
+    """
+    Order positions so value-returning ones are redeemed first.
+
+    Positions worth min_redemption_value or less (typically losses) only burn
+    gas for no USDC back, so they go last, or are skipped entirely when
+    skip_zero_value_redemptions is set.
+
+    Returns:
+        Tuple of (positions to redeem in order, skipped positions)
+    """
+    valuable = []
+    worthless = []
+    for pos in positions:
+        if float(pos.get("currentValue", 0)) > settings.min_redemption_value:
+            valuable.append(pos)
+        else:
+            worthless.append(pos)
+
+    if settings.skip_zero_value_redemptions:
+        return valuable, worthless
+    return valuable + worthless, []
+
+
 async def redeem_all_positions() -> dict:
     """
     Redeem all redeemable positions for the configured wallet.
@@ -179,6 +327,13 @@ async def redeem_all_positions() -> dict:
         log.debug("No positions to redeem")
         return {"redeemed": 0, "total_value": 0, "positions": []}
 
+    positions, skipped = order_positions_for_redemption(positions, settings)
+    if skipped:
+        log.info("Skipping zero-value positions", count=len(skipped))
+    if not positions:
+        log.debug("No valuable positions to redeem")
+        return {"redeemed": 0, "total_value": 0, "positions": []}
+
     # Calculate total redeemable value
     total_redeemable = sum(float(p.get("currentValue", 0)) for p in positions)
     log.info(
@@ -188,12 +343,14 @@ async def redeem_all_positions() -> dict:
         matic_balance=f"{matic_balance:.4f}",
     )
 
-    results = []
-    total_value = 0
+    private_key = settings.private_key.get_secret_value()
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(REDEMPTION_CONCURRENCY)
     insufficient_gas_hit = False
 
-    # Redeem each position
-    for pos in positions:
+    async def _redeem_one(pos: dict) -> Optional[dict]:
+        nonlocal insufficient_gas_hit
+
         condition_id = pos.get("conditionId")
         size = float(pos.get("size", 0))
         outcome_index = pos.get("outcomeIndex", 0)
@@ -202,68 +359,95 @@ async def redeem_all_positions() -> dict:
         title = pos.get("title", "Unknown")
 
         if not condition_id or size <= 0:
-            continue
-
-        # Skip if we already hit insufficient gas - no point trying more
-        if insufficient_gas_hit:
-            results.append({
-                "market": title,
-                "size": size,
-                "value": current_value,
-                "success": False,
-                "error": "skipped_no_gas",
-            })
-            continue
-
-        log.debug(
-            "Processing redemption",
-            market=title[:50],
-            size=size,
-            value=current_value,
-        )
+            return None
+
+        async with semaphore:
+            # Skip if we already hit insufficient gas - no point trying more
+            if insufficient_gas_hit:
+                return {
+                    "market": title,
+                    "size": size,
+                    "value": current_value,
+                    "success": False,
+                    "error": "skipped_no_gas",
+                }
+
+            log.debug(
+                "Processing redemption",
+                market=title[:50],
+                size=size,
+                value=current_value,
+            )
 
-        # Run redemption in thread pool to not block
-        loop = asyncio.get_event_loop()
-        receipt, error_type = await loop.run_in_executor(
-            None,
-            redeem_position_sync,
-            settings.private_key.get_secret_value(),
-            condition_id,
-            size,
-            outcome_index,
-            neg_risk,
-        )
+            # Run redemption in dedicated thread pool to not block
+            async with _REDEEM_LIMITER:
+                tx_hash, error_type = await loop.run_in_executor(
+                    _REDEEM_POOL,
+                    redeem_position_sync,
+                    private_key,
+                    condition_id,
+                    size,
+                    outcome_index,
+                    neg_risk,
+                )
 
         # Check if we ran out of gas
         if error_type == "insufficient_gas":
             insufficient_gas_hit = True
-            results.append({
+            return {
                 "market": title,
                 "size": size,
                 "value": current_value,
                 "success": False,
                 "error": "insufficient_gas",
-            })
-            continue
+            }
 
-        results.append({
+        return {
             "market": title,
             "size": size,
             "value": current_value,
-            "success": receipt is not None,
-            "tx_hash": str(receipt.transaction_hash) if receipt and hasattr(receipt, 'transaction_hash') else None,
+            "success": tx_hash is not None,
+            "tx_hash": tx_hash,
             "error": error_type,
-        })
+        }
 
-        if receipt:
-            total_value += current_value
+    # Redeem positions concurrently, bounded by the semaphore
+    outcomes = await asyncio.gather(
+        *[_redeem_one(pos) for pos in positions],
+        return_exceptions=True,
+    )
 
-        # Small delay between redemptions to avoid rate limits
-        await asyncio.sleep(1)
+    # Collect results and tally them in a single pass
+    results = []
+    redeemed = failed = 0
+    total_value = 0.0
+    for pos, outcome in zip(positions, outcomes):
+        if isinstance(outcome, BaseException):
+            log.error(
+                "Redemption task failed",
+                market=str(pos.get("title", "Unknown"))[:50],
+                error=str(outcome),
+            )
+            # Raw fields, since they may be what failed to parse
+            outcome = {
+                "market": pos.get("title", "Unknown"),
+                "size": pos.get("size"),
+                "value": pos.get("currentValue"),
+                "success": False,
+                "error": "exception",
+            }
+        elif outcome is None:
+            continue
+        results.append(outcome)
+        if outcome["success"]:
+            redeemed += 1
+            total_value += outcome["value"]
+        else:
+            failed += 1
 
     summary = {
-        "redeemed": sum(1 for r in results if r.get("success")),
-        "failed": sum(1 for r in results if not r.get("success")),
+        "redeemed": redeemed,
+        "failed": failed,
         "total_value": total_value,
         "positions": results,
     }
@@ -0,0 +1,207 @@
+"""Tests for the auto-redemption module."""
+
+from typing import Any, AsyncIterator, Callable, Optional
+
+import httpx
+import pytest
+
+from karb.config import Settings
+from karb.executor import redemption
+
+
+def make_settings(**overrides: Any) -> Settings:
+    """Build settings with a test wallet, ignoring the local .env file."""
+    values: dict[str, Any] = {
+        "private_key": "0x" + "1" * 64,
+        "wallet_address": "0x" + "a" * 40,
+        "dry_run": False,
+    }
+    values.update(overrides)
+    return Settings(_env_file=None, **values)
+
+
+def make_position(title: str, value: float, size: Any = 10.0) -> dict[str, Any]:
+    return {
+        "conditionId": "0x" + title.encode().hex().ljust(64, "0"),
+        "title": title,
+        "size": size,
+        "currentValue": value,
+        "outcomeIndex": 0,
+        "negativeRisk": False,
+    }
+
+
+@pytest.fixture
+def redeem_env(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    """Stub out settings, the gas check, the positions fetch and on-chain redemption."""
+    env: dict[str, Any] = {
+        "settings": make_settings(),
+        "positions": [],
+        "redeemed": [],
+    }
+
+    async def fake_matic_balance(wallet_address: str) -> float:
+        return 1.0
+
+    async def fake_positions(wallet_address: str) -> list[dict]:
+        return env["positions"]
+
+    def fake_redeem(
+        private_key: str,
+        condition_id: str,
+        size: float,
+        outcome_index: int,
+        neg_risk: bool = False,
+    ) -> tuple[Optional[str], Optional[str]]:
+        env["redeemed"].append(condition_id)
+        return "0xhash", None
+
+    monkeypatch.setattr(redemption, "get_settings", lambda: env["settings"])
+    monkeypatch.setattr(redemption, "get_matic_balance", fake_matic_balance)
+    monkeypatch.setattr(redemption, "get_redeemable_positions", fake_positions)
+    monkeypatch.setattr(redemption, "redeem_position_sync", fake_redeem)
+    monkeypatch.setattr(redemption, "_REDEEM_LIMITER", redemption._RateLimiter(max_rate=1000))
+    return env
+
+
+async def test_malformed_position_is_counted_as_failed(redeem_env: dict[str, Any]) -> None:
+    good = make_position("Good", 5.0)
+    bad = make_position("Bad", 1.0, size="not-a-number")
+    redeem_env["positions"] = [good, bad]
+
+    summary = await redemption.redeem_all_positions()
+
+    assert summary["redeemed"] == 1
+    assert summary["failed"] == 1
+    failed = [p for p in summary["positions"] if not p["success"]]
+    assert failed == [
+        {
+            "market": "Bad",
+            "size": "not-a-number",
+            "value": 1.0,
+            "success": False,
+            "error": "exception",
+        }
+    ]
+
+
+async def test_valuable_positions_are_redeemed_first(redeem_env: dict[str, Any]) -> None:
+    loss = make_position("Loss", 0.0)
+    win = make_position("Win", 5.0)
+    dust = make_position("Dust", 0.005)
+    small_win = make_position("Small win", 2.0)
+    redeem_env["positions"] = [loss, win, dust, small_win]
+
+    summary = await redemption.redeem_all_positions()
+
+    assert redeem_env["redeemed"] == [
+        win["conditionId"],
+        small_win["conditionId"],
+        loss["conditionId"],
+        dust["conditionId"],
+    ]
+    assert summary["redeemed"] == 4
+    assert summary["total_value"] == pytest.approx(7.005)
+
+
+async def test_zero_value_positions_are_skipped_when_configured(
+    redeem_env: dict[str, Any],
+) -> None:
+    redeem_env["settings"] = make_settings(skip_zero_value_redemptions=True)
+    loss = make_position("Loss", 0.0)
+    win = make_position("Win", 5.0)
+    redeem_env["positions"] = [loss, win]
+
+    summary = await redemption.redeem_all_positions()
+
+    assert redeem_env["redeemed"] == [win["conditionId"]]
+    assert [p["market"] for p in summary["positions"]] == ["Win"]
+    assert summary["failed"] == 0
+
+
+async def test_only_zero_value_positions_skips_redemption(redeem_env: dict[str, Any]) -> None:
+    redeem_env["settings"] = make_settings(
+        skip_zero_value_redemptions=True,
+        min_redemption_value=1.0,
+    )
+    redeem_env["positions"] = [make_position("Loss", 0.0), make_position("Dust", 0.5)]
+
+    summary = await redemption.redeem_all_positions()
+
+    assert redeem_env["redeemed"] == []
+    assert summary == {"redeemed": 0, "total_value": 0, "positions": []}
+
+
+@pytest.fixture
+async def data_api(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[Callable[..., dict[str, Any]]]:
+    """Serve Data API responses from a scripted list and record retry delays."""
+    clients: list[httpx.AsyncClient] = []
+
+    def install(*responses: Any) -> dict[str, Any]:
+        calls: dict[str, Any] = {"requests": [], "sleeps": []}
+        script = list(responses)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls["requests"].append(request)
+            response = script.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        async def fake_sleep(delay: float) -> None:
+            calls["sleeps"].append(delay)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        monkeypatch.setattr(redemption, "_client", client)
+        monkeypatch.setattr(redemption, "_sleep", fake_sleep)
+        return calls
+
+    yield install
+
+    for client in clients:
+        await client.aclose()
+
+
+async def test_positions_fetch_retries_server_errors(
+    data_api: Callable[..., dict[str, Any]],
+) -> None:
+    position = {"conditionId": "0x1", "redeemable": True}
+    calls = data_api(httpx.Response(502), httpx.Response(200, json=[position]))
+
+    positions = await redemption.get_redeemable_positions("0xwallet")
+
+    assert positions == [position]
+    assert len(calls["requests"]) == 2
+    assert calls["requests"][0].url.params["redeemable"] == "true"
+    assert len(calls["sleeps"]) == 1
+    assert 1.0 <= calls["sleeps"][0] < 1.2
+
+
+async def test_positions_fetch_does_not_retry_client_errors(
+    data_api: Callable[..., dict[str, Any]],
+) -> None:
+    calls = data_api(httpx.Response(404))
+
+    positions = await redemption.get_redeemable_positions("0xwallet")
+
+    assert positions == []
+    assert len(calls["requests"]) == 1
+    assert calls["sleeps"] == []
+
+
+async def test_positions_fetch_gives_up_after_repeated_timeouts(
+    data_api: Callable[..., dict[str, Any]],
+) -> None:
+    calls = data_api(*[httpx.ReadTimeout("timed out") for _ in range(3)])
+
+    positions = await redemption.get_redeemable_positions("0xwallet")
+
+    assert positions == []
+    assert len(calls["requests"]) == redemption.DATA_API_MAX_ATTEMPTS
+    # Exponential backoff with jitter between attempts
+    assert len(calls["sleeps"]) == 2
+    assert 1.0 <= calls["sleeps"][0] < 1.2
+    assert 2.0 <= calls["sleeps"][1] < 2.2